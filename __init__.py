@@ -4,6 +4,18 @@ Rhinegeist - A Python package for time series preprocessing, forecasting, classi
 
 __version__ = "0.0.0"
 
-from .sequences import shingle_timeseries, generate_target_timeseries, check_data_frequency
+from .sequences import (
+    shingle_timeseries,
+    ishingle_timeseries,
+    shingle_reduce,
+    generate_target_timeseries,
+    check_data_frequency,
+)
 
-__all__ = ["shingle_timeseries", "generate_target_timeseries", "check_data_frequency"]
+__all__ = [
+    "shingle_timeseries",
+    "ishingle_timeseries",
+    "shingle_reduce",
+    "generate_target_timeseries",
+    "check_data_frequency",
+]
@@ -11,6 +11,9 @@ from .fetch_data_functional import (
     normalize_site_id,
     get_gauge_fields,
     get_gauge_data,
+    close_session,
+    enable_cache,
+    clear_cache,
     PARAMETER_CODES,
 )
 
@@ -18,6 +21,9 @@ __all__ = [
     'normalize_site_id',
     'get_gauge_fields',
     'get_gauge_data',
+    'close_session',
+    'enable_cache',
+    'clear_cache',
     'PARAMETER_CODES',
 ]
 
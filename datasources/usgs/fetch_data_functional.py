@@ -9,16 +9,136 @@ Main Functions:
     3. normalize_site_id(site_id) - Clean up site ID format
 """
 
+import copy
+import csv
+import datetime
+import functools
+import io
+import re
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import pandas as pd
 from typing import Dict, List, Optional
 import warnings
 
+# orjson decodes large USGS responses several times faster than the standard
+# library; it is optional and returns the same plain dicts and lists
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 
 # USGS API Endpoints
 SITE_URL = "https://waterservices.usgs.gov/nwis/site/"
 DV_URL = "https://waterservices.usgs.gov/nwis/dv/"
 
+
+# (connect, read) timeouts in seconds: fail fast when the host is
+# unreachable, but give large responses time to arrive
+_TIMEOUT = (5, 30)
+
+
+def _create_session(
+    cache_name: Optional[str] = None,
+    expire_after: int = 86400
+) -> requests.Session:
+    """
+    Internal function to build the HTTP session shared by all USGS requests.
+
+    Keep-alive connections are pooled per host so repeated calls skip the
+    TCP and TLS handshakes, and transient server errors are retried with
+    backoff.
+
+    Args:
+        cache_name: If given, responses are cached in this SQLite database
+                    (requires the optional ``requests-cache`` package)
+        expire_after: Seconds a cached response stays valid
+    """
+    if cache_name is None:
+        session = requests.Session()
+    else:
+        try:
+            import requests_cache
+        except ImportError as e:
+            raise ImportError(
+                "Caching USGS responses requires the optional 'requests-cache' "
+                "package: pip install 'chronos[cache]'"
+            ) from e
+        session = requests_cache.CachedSession(
+            cache_name,
+            backend='sqlite',
+            expire_after=expire_after,
+            allowable_methods=['GET']
+        )
+
+    # requests already asks for gzip/deflate (USGS JSON shrinks several-fold);
+    # identify the client so USGS can attribute the traffic
+    session.headers['User-Agent'] = 'chronos'
+
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    session.mount(
+        'https://',
+        HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+    )
+    return session
+
+
+_SESSION = _create_session()
+
+
+def close_session() -> None:
+    """
+    Close the pooled connections held by the shared USGS session.
+
+    Long-lived callers can use this to release sockets; the session stays
+    usable and reconnects on the next request.
+    """
+    _SESSION.close()
+
+
+def enable_cache(cache_name: str = 'usgs_cache', expire_after: int = 86400) -> None:
+    """
+    Cache USGS responses on disk so repeated requests skip the network.
+
+    Site metadata and past daily values rarely change, so repeat lookups for
+    the same site and period are served from a local SQLite database.
+    Requests for periods ending today or later always go to USGS, since
+    their data is still being updated. Requires the optional
+    ``requests-cache`` package.
+
+    Args:
+        cache_name: Name (or path) of the SQLite cache database
+        expire_after: Seconds a cached response stays valid (default: 1 day)
+
+    Examples:
+        >>> enable_cache()
+        >>> df = get_gauge_data('01646500', '2023-01-01', '2023-12-31')
+    """
+    global _SESSION
+    session = _create_session(cache_name, expire_after)
+    _SESSION.close()
+    _SESSION = session
+
+
+def clear_cache() -> None:
+    """
+    Remove all cached USGS responses and memoized gauge lookups.
+
+    The on-disk response cache is only present if it was enabled with
+    enable_cache().
+    """
+    _fetch_gauge_fields.cache_clear()
+    if hasattr(_SESSION, 'cache'):
+        _SESSION.cache.clear()
+
+
 # Common USGS Parameter Codes
 PARAMETER_CODES = {
     'streamflow': '00060',      # Discharge, cubic feet per second
@@ -28,7 +148,27 @@ PARAMETER_CODES = {
     'air_temp': '00020',        # Temperature, air, degrees Celsius
 }
 
+# Reverse lookup from parameter code to friendly name
+_CODE_TO_NAME = {code: name for name, code in PARAMETER_CODES.items()}
+_CODE_SET = frozenset(PARAMETER_CODES.values())
+
+
+# RDB site columns reported by get_gauge_fields()
+_SITE_FIELDS = (
+    'site_no',
+    'station_nm',
+    'dec_lat_va',
+    'dec_long_va',
+    'state_cd',
+    'drain_area_va',
+)
+
+
+# Optional 'USGS' / 'USGS-' prefix (any case) in front of a site ID
+_USGS_PREFIX_RE = re.compile(r'^\s*USGS-?', re.IGNORECASE)
 
+
+@functools.lru_cache(maxsize=1024)
 def normalize_site_id(site_id: str) -> str:
     """
     Clean up USGS site ID by removing 'USGS' prefix and whitespace.
@@ -45,14 +185,7 @@ def normalize_site_id(site_id: str) -> str:
         >>> normalize_site_id('  01646500  ')
         '01646500'
     """
-    cleaned = site_id.strip()
-
-    if cleaned.upper().startswith('USGS-'):
-        return cleaned[5:].strip()
-    elif cleaned.upper().startswith('USGS'):
-        return cleaned[4:].strip()
-
-    return cleaned
+    return _USGS_PREFIX_RE.sub('', site_id, count=1).strip()
 
 
 def get_gauge_fields(site_id: str) -> Dict[str, Dict]:
@@ -85,64 +218,56 @@ def get_gauge_fields(site_id: str) -> Dict[str, Dict]:
         >>> print(fields['site_name'])
         >>> print(fields['available_parameters'].keys())
     """
-    site_id = normalize_site_id(site_id)
+    # Lookups are memoized per site; hand out a copy so callers can't
+    # modify the cached result
+    return copy.deepcopy(_fetch_gauge_fields(normalize_site_id(site_id)))
+
 
+@functools.lru_cache(maxsize=1024)
+def _fetch_gauge_fields(site_id: str) -> Dict[str, Dict]:
+    """
+    Internal function to fetch and parse the metadata of a gauge.
+
+    Site metadata rarely changes, so results are kept for the life of the
+    process (see clear_cache()). Failed lookups raise and are not cached.
+
+    Args:
+        site_id: USGS site identifier (already normalized)
+
+    Returns:
+        Dictionary with available fields and their metadata, see
+        get_gauge_fields()
+    """
     # Get site info and available parameters
     url = f"{SITE_URL}?format=rdb&sites={site_id}&seriesCatalogOutput=true&siteOutput=expanded"
 
     try:
-        response = requests.get(url, timeout=30)
+        response = _SESSION.get(url, timeout=_TIMEOUT)
         response.raise_for_status()
         rdb_text = response.text
     except requests.exceptions.RequestException as e:
         raise ValueError(f"Error fetching gauge info for site {site_id}: {e}")
 
-    # Parse RDB format
-    lines = rdb_text.split('\n')
-
-    # Find site info
-    site_info = {}
-    header_idx = None
-    header = []
-
-    for i, line in enumerate(lines):
-        if line.startswith('agency_cd\t'):
-            header_idx = i
-            header = line.split('\t')
-            if i + 2 < len(lines):
-                data = lines[i + 2].split('\t')
-                site_info = dict(zip(header, data))
-            break
-
-    if not site_info:
+    # Parse RDB format: one row per data series, site columns repeated
+    table = _parse_rdb(rdb_text)
+    if table.empty:
         raise ValueError(f"Site {site_id} not found in USGS database")
 
+    # Site details repeat on every row; only a handful of columns are used
+    first_row = table.iloc[0]
+    site_info = {
+        field: first_row[field] for field in _SITE_FIELDS if field in table.columns
+    }
+
     # Parse available parameters
     available_params = {}
-    if header_idx is not None and header:
-        for line in lines:
-            if line.startswith('#'):
-                continue
-            parts = line.split('\t')
-
-            # Look for parameter codes in the data
-            if len(parts) > 5 and 'parm_cd' in header:
-                try:
-                    parm_idx = header.index('parm_cd')
-                    if parm_idx < len(parts):
-                        param_code = parts[parm_idx]
-                        if param_code and param_code.isdigit():
-                            # Try to find parameter name
-                            param_name = next(
-                                (name for name, code in PARAMETER_CODES.items() if code == param_code),
-                                f"parameter_{param_code}"
-                            )
-                            available_params[param_code] = {
-                                'name': param_name,
-                                'code': param_code
-                            }
-                except (ValueError, IndexError):
-                    continue
+    if 'parm_cd' in table.columns:
+        for param_code in table['parm_cd'].unique():
+            if param_code and param_code.isdigit():
+                available_params[param_code] = {
+                    'name': _CODE_TO_NAME.get(param_code, f"parameter_{param_code}"),
+                    'code': param_code
+                }
 
     return {
         'site_id': site_info.get('site_no', site_id),
@@ -155,6 +280,40 @@ def get_gauge_fields(site_id: str) -> Dict[str, Dict]:
     }
 
 
+def _parse_rdb(rdb_text: str) -> pd.DataFrame:
+    """
+    Internal function to parse a USGS RDB (tab-delimited) response.
+
+    Args:
+        rdb_text: Raw RDB response body
+
+    Returns:
+        DataFrame of string columns, one row per data line, with the RDB
+        column-format row removed. Empty if the response holds no table.
+    """
+    # Jump straight past the '#' comment block to the header line
+    if rdb_text.startswith('agency_cd\t'):
+        header_start = 0
+    else:
+        header_start = rdb_text.find('\nagency_cd\t')
+        if header_start == -1:
+            return pd.DataFrame()
+        header_start += 1
+
+    # RDB has no quoting, and '#' may appear inside fields such as station
+    # names, so neither is given special meaning
+    table = pd.read_csv(
+        io.StringIO(rdb_text[header_start:]),
+        sep='\t',
+        dtype=str,
+        keep_default_na=False,
+        quoting=csv.QUOTE_NONE
+    )
+
+    # The first row after the header describes column formats (e.g. '5s')
+    return table.iloc[1:].reset_index(drop=True)
+
+
 def get_gauge_data(
     site_id: str,
     start_date: str,
@@ -175,7 +334,10 @@ def get_gauge_data(
         daily: If True, fetch daily averages. If False, fetch instantaneous values.
 
     Returns:
-        DataFrame with datetime index and columns for each parameter
+        DataFrame with datetime index and a float32 column for each parameter.
+        Instantaneous values (daily=False) are indexed by UTC timestamps, since
+        their local offsets change across daylight saving time; daily values
+        keep a timezone-naive date index.
 
     Examples:
         >>> # Get all available data
@@ -198,55 +360,55 @@ def get_gauge_data(
     # Convert parameter names to codes
     param_codes = []
     for param in parameters:
-        if param in PARAMETER_CODES:
-            param_codes.append(PARAMETER_CODES[param])
-        elif param.isdigit():
-            param_codes.append(param)
+        name = param.strip()
+        if name in PARAMETER_CODES:
+            param_codes.append(PARAMETER_CODES[name])
+        elif name in _CODE_SET or (len(name) == 5 and name.isdigit()):
+            param_codes.append(name)
         else:
             warnings.warn(f"Unknown parameter: {param}")
 
+    # A name and its code may both be given; request each code only once
+    param_codes = list(dict.fromkeys(param_codes))
+
     if not param_codes:
         raise ValueError("No valid parameters specified")
 
-    # Fetch data for each parameter
-    all_data = []
-
-    for param_code in param_codes:
-        df = _fetch_single_parameter(site_id, param_code, start_date, end_date, daily)
-        if not df.empty:
-            all_data.append(df)
+    # Fetch all parameters in a single request
+    all_data = _fetch_parameters(site_id, param_codes, start_date, end_date, daily)
 
     if not all_data:
         warnings.warn(f"No data available for site {site_id} in the specified period")
         return pd.DataFrame()
 
-    # Merge all parameters
-    result = all_data[0]
-    for df in all_data[1:]:
-        result = result.join(df, how='outer')
+    # Merge all parameters with a single index union
+    return pd.concat(all_data, axis=1, join='outer', sort=True)
 
-    return result
 
-
-def _fetch_single_parameter(
+def _fetch_parameters(
     site_id: str,
-    parameter_code: str,
+    parameter_codes: List[str],
     start_date: str,
     end_date: str,
     daily: bool
-) -> pd.DataFrame:
+) -> List[pd.DataFrame]:
     """
-    Internal function to fetch a single parameter.
+    Internal function to fetch several parameters in one request.
+
+    The USGS services accept a comma-separated list of parameter codes and
+    return one time series per parameter, so a single round trip covers all
+    of them.
 
     Args:
         site_id: USGS site identifier (already normalized)
-        parameter_code: USGS parameter code
+        parameter_codes: USGS parameter codes
         start_date: Start date 'YYYY-MM-DD'
         end_date: End date 'YYYY-MM-DD'
         daily: Whether to fetch daily or instantaneous values
 
     Returns:
-        DataFrame with the parameter data
+        List of single-column DataFrames, in the order of parameter_codes,
+        for the parameters that returned data
     """
     url = DV_URL if daily else "https://waterservices.usgs.gov/nwis/iv/"
 
@@ -255,7 +417,7 @@ def _fetch_single_parameter(
         'sites': site_id,
         'startDT': start_date,
         'endDT': end_date,
-        'parameterCd': parameter_code,
+        'parameterCd': ','.join(parameter_codes),
         'siteStatus': 'all'
     }
 
@@ -263,39 +425,74 @@ def _fetch_single_parameter(
         params['statCd'] = '00003'  # Mean value
 
     try:
-        response = requests.get(url, params=params, timeout=30)
+        # Past values never change, but a period reaching today is still being
+        # filled in, so it bypasses the response cache (see enable_cache()).
+        # The bypass is a header on this request alone, since other threads
+        # may be using the same session
+        headers = {}
+        if pd.Timestamp(end_date).date() >= datetime.date.today():
+            headers['Cache-Control'] = 'no-store'
+        response = _SESSION.get(url, params=params, headers=headers, timeout=_TIMEOUT)
         response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.RequestException as e:
-        warnings.warn(f"Error fetching parameter {parameter_code}: {e}")
-        return pd.DataFrame()
+        data = _json_loads(response.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        warnings.warn(f"Error fetching parameters {', '.join(parameter_codes)}: {e}")
+        return []
 
     # Parse JSON response
     if not data or 'value' not in data or 'timeSeries' not in data['value']:
-        return pd.DataFrame()
+        return []
 
-    time_series = data['value']['timeSeries']
-    if len(time_series) == 0:
-        return pd.DataFrame()
+    # Keep the first series reported for each parameter code
+    series_by_code = {}
+    for time_series in data['value']['timeSeries']:
+        code = time_series['variable']['variableCode'][0]['value']
+        series_by_code.setdefault(code, time_series)
 
-    values_list = time_series[0]['values'][0]['value']
+    frames = []
+    for parameter_code in parameter_codes:
+        if parameter_code in series_by_code:
+            df = _series_to_frame(series_by_code[parameter_code], parameter_code, daily)
+            if not df.empty:
+                frames.append(df)
+    return frames
+
+
+def _series_to_frame(time_series: Dict, parameter_code: str, daily: bool) -> pd.DataFrame:
+    """
+    Internal function to turn one USGS JSON time series into a DataFrame.
+
+    Args:
+        time_series: One entry of the response's 'timeSeries' list
+        parameter_code: USGS parameter code of the series
+        daily: Whether the series holds daily or instantaneous values
+
+    Returns:
+        DataFrame with the parameter data
+    """
+    values_list = time_series['values'][0]['value']
     if len(values_list) == 0:
         return pd.DataFrame()
 
-    variable_name = time_series[0]['variable']['variableName']
+    variable_name = time_series['variable']['variableName']
 
-    # Create DataFrame
-    df = pd.DataFrame(values_list)
-    df['dateTime'] = pd.to_datetime(df['dateTime'])
-    df['value'] = pd.to_numeric(df['value'], errors='coerce')
-    df = df.set_index('dateTime')
+    # Pull the two fields we need into flat lists in a single pass rather
+    # than building a frame from one dict per observation
+    date_times = [obs['dateTime'] for obs in values_list]
+    values = [obs['value'] for obs in values_list]
 
-    # Use friendly column name if possible
-    param_name = next(
-        (name for name, code in PARAMETER_CODES.items() if code == parameter_code),
-        variable_name
+    # Timestamps are ISO 8601; instantaneous values carry a UTC offset that
+    # changes with daylight saving time, so they are converted to UTC
+    index = pd.DatetimeIndex(
+        pd.to_datetime(date_times, format='ISO8601', utc=not daily, cache=True),
+        name='dateTime'
     )
 
-    return df[['value']].rename(columns={'value': param_name})
+    # Values are stored as float32: its ~7 significant digits are well beyond
+    # USGS sensor precision and it halves memory for downstream joins
+    values = pd.to_numeric(values, errors='coerce').astype(np.float32)
 
+    # Use friendly column name if possible
+    param_name = _CODE_TO_NAME.get(parameter_code, variable_name)
 
+    return pd.DataFrame({param_name: values}, index=index)
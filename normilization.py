@@ -1,4 +1,7 @@
+import contextlib
 import typing
+import warnings
+import numpy as np
 import pandas as pd
 
 
@@ -13,25 +16,38 @@ def normalize(data: typing.Union[pd.Series, pd.DataFrame], normalization_method:
 
 
 def min_max_normalization(data: typing.Union[pd.DataFrame]) -> tuple[typing.Union[pd.DataFrame], dict]:
-    normalization_parameters = {}
-    normalized_data = pd.DataFrame()
-    for column in data.columns:
-        normalization_parameters[column] = {}
-        normalization_parameters[column]['min'] = data[column].min()
-        normalization_parameters[column]['max'] = data[column].max()
-        normalization_parameters[column]['mean'] = data.mean()
-        normalized_data_i = (data.iloc[:, column] - normalization_parameters['mean']) / (normalization_parameters['max'] - normalization_parameters['min'])
-        normalized_data = pd.concat([normalized_data, normalized_data_i], axis=1)
+    arr = data.to_numpy(dtype=np.float64)
+    with _quiet_nan_statistics():
+        data_min = np.nanmin(arr, axis=0)
+        data_max = np.nanmax(arr, axis=0)
+        data_mean = np.nanmean(arr, axis=0)
+        normalized = (arr - data_mean) / (data_max - data_min)
+    normalized_data = pd.DataFrame(normalized, index=data.index, columns=data.columns)
+    normalization_parameters = {
+        column: {'min': data_min[i], 'max': data_max[i], 'mean': data_mean[i]}
+        for i, column in enumerate(data.columns)
+    }
     return normalized_data, normalization_parameters
 
 
 def mean_std_normalization(data: typing.Union[pd.DataFrame]) -> tuple[typing.Union[pd.DataFrame], dict]:
-    normalization_parameters = {}
-    normalized_data = pd.DataFrame()
-    for column in data.columns:
-        normalization_parameters[column] = {}
-        normalization_parameters[column]['mean'] = data[column].mean()
-        normalization_parameters[column]['std'] = data[column].std()
-        normalized_data_i = (data.iloc[:, column] - normalization_parameters['mean']) / normalization_parameters['std']
-        normalized_data = pd.concat([normalized_data, normalized_data_i], axis=1)
+    arr = data.to_numpy(dtype=np.float64)
+    with _quiet_nan_statistics():
+        data_mean = np.nanmean(arr, axis=0)
+        data_std = np.nanstd(arr, axis=0, ddof=1)
+        normalized = (arr - data_mean) / data_std
+    normalized_data = pd.DataFrame(normalized, index=data.index, columns=data.columns)
+    normalization_parameters = {
+        column: {'mean': data_mean[i], 'std': data_std[i]}
+        for i, column in enumerate(data.columns)
+    }
     return normalized_data, normalization_parameters
+
+
+@contextlib.contextmanager
+def _quiet_nan_statistics() -> typing.Iterator[None]:
+    # constant, single-value and all-NaN columns give NaN or inf statistics,
+    # which pandas returned silently; NumPy warns about them instead
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        yield
@@ -1,33 +1,192 @@
+import os
 import typing
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import numpy.typing
 import pandas as pd
 
 
 # shingling timeseries for feature engineering
 def shingle_timeseries(
+    data: pd.DataFrame,
+    window_size: typing.Union[pd.Timedelta, int],
+    dtype: typing.Optional[np.typing.DTypeLike] = None,
+) -> pd.DataFrame:
+
+    window_size = _window_steps(data, window_size)
+
+    # view every window without copying, shape (N - W + 1, C, W); Fortran
+    # order keeps each column contiguous so the window axis is read sequentially.
+    # Casting to the requested dtype happens here, before the windows are
+    # duplicated, so the copy below already moves the narrower type
+    arr = np.asfortranarray(data.to_numpy(dtype=dtype))
+    windows = np.lib.stride_tricks.sliding_window_view(arr, window_size, axis=0)
+
+    # materialise the windows with a single copy into a preallocated buffer,
+    # reversing the window axis so the most recent sample comes first (t-0,
+    # t-1, ...); the buffer is C-contiguous so flattening it to 2D is free
+    n_windows = windows.shape[0]
+    shingled_values = np.empty((n_windows, arr.shape[1], window_size), dtype=arr.dtype)
+    _fill_windows(shingled_values, windows)
+    shingled_values = shingled_values.reshape(n_windows, -1)
+
+    # the lag suffixes are shared by every column, so format them only once
+    suffixes = [f"_t-{j}" for j in range(window_size)]
+    shingled_columns = [
+        f"{column}{suffix}" for column in data.columns for suffix in suffixes
+    ]
+    return pd.DataFrame(
+        shingled_values,
+        index=data.index[window_size - 1 :],
+        columns=shingled_columns,
+        copy=False,
+    )
+
+
+# lazy shingling for callers that consume windows one at a time
+def ishingle_timeseries(
     data: pd.DataFrame, window_size: typing.Union[pd.Timedelta, int]
+) -> tuple[np.ndarray, pd.Index]:
+    # zero-copy counterpart of shingle_timeseries: returns a read-only view of
+    # shape (N - W + 1, C, W) where windows[i, c, j] is column c at lag t-j of
+    # the window ending at index[i]; nothing is duplicated, so iterating over
+    # the windows needs no memory beyond the input itself
+    window_size = _window_steps(data, window_size)
+    arr = np.asfortranarray(data.to_numpy())
+    windows = np.lib.stride_tricks.sliding_window_view(arr, window_size, axis=0)
+    return windows[:, :, ::-1], data.index[window_size - 1 :]
+
+
+# window reductions supported by shingle_reduce
+_SHINGLE_REDUCTIONS = {
+    "sum": np.sum,
+    "mean": np.mean,
+    "min": np.min,
+    "max": np.max,
+    "median": np.median,
+}
+
+
+# shingling fused with a reduction over each window
+def shingle_reduce(
+    data: pd.DataFrame, window_size: typing.Union[pd.Timedelta, int], op: str
 ) -> pd.DataFrame:
+    if op not in _SHINGLE_REDUCTIONS:
+        raise ValueError(f"Reduction '{op}' is not supported.")
+
+    window_size = _window_steps(data, window_size)
+    arr = data.to_numpy()
+
+    # both paths return the dtype NumPy's own reduction would give
+    out_dtype = _SHINGLE_REDUCTIONS[op](
+        np.zeros((1, 1), dtype=arr.dtype), axis=-1
+    ).dtype
+
+    numeric = arr.dtype.kind in "iub" or (
+        arr.dtype.kind == "f" and np.isfinite(arr).all()
+    )
+    if op in ("sum", "mean") and numeric:
+        # running-sum fast path, O(N) instead of O(N * W): each window sum is
+        # the difference of two cumulative sums. NaN or inf would poison every
+        # later window, so such data takes the generic path below
+        if op == "mean" and arr.dtype.kind in "iub":
+            # like np.mean, integers are averaged in float64 so window sums
+            # beyond the int64 range do not wrap around
+            arr = arr.astype(np.float64)
+        reduced = _window_sums(arr, window_size)
+        if op == "mean":
+            reduced = reduced / window_size
+        reduced = reduced.astype(out_dtype, copy=False)
+    else:
+        windows = np.lib.stride_tricks.sliding_window_view(arr, window_size, axis=0)
+        reduced = _SHINGLE_REDUCTIONS[op](windows, axis=-1)
+
+    return pd.DataFrame(
+        reduced,
+        index=data.index[window_size - 1 :],
+        columns=[f"{column}_{op}" for column in data.columns],
+        copy=False,
+    )
+
+
+# windows summed per running-sum block in _window_sums
+_RUNNING_SUM_BLOCK = 4096
+
+
+def _window_sums(arr: np.ndarray, window_size: int) -> np.ndarray:
+    if arr.dtype.kind in "iub":
+        # integer cumulative sums are exact
+        cumsum = np.cumsum(arr, axis=0)
+        sums = cumsum[window_size - 1 :].copy()
+        sums[1:] -= cumsum[:-window_size]
+        return sums
 
-    # check frequency to ensure uniform sampling
-    freq = check_data_frequency(data)
+    # floats are centred on each column's mean and the cumulative sum restarts
+    # every block, so its magnitude (and with it the cancellation error) stays
+    # bounded by a block of deviations rather than growing with the series
+    offset = arr.mean(axis=0, dtype=np.float64)
+    centred = arr - offset
+    n_windows = arr.shape[0] - window_size + 1
+    sums = np.empty((n_windows, arr.shape[1]), dtype=np.float64)
+    block = max(_RUNNING_SUM_BLOCK, window_size)
+    for start in range(0, n_windows, block):
+        stop = min(start + block, n_windows)
+        cumsum = np.cumsum(centred[start : stop + window_size - 1], axis=0)
+        sums[start:stop] = cumsum[window_size - 1 :]
+        sums[start + 1 : stop] -= cumsum[: stop - start - 1]
+    sums += offset * window_size
+    return sums
 
-    # TODO: handle window size better
+
+def _window_steps(
+    data: pd.DataFrame, window_size: typing.Union[pd.Timedelta, int]
+) -> int:
+    # TODO: a Timedelta window on a numeric or period index still fails with
+    # TypeError, since its step is not a Timedelta
     if isinstance(window_size, pd.Timedelta):
-        window_size = window_size / freq
-        window_size = int(window_size)
-
-    shingled_data = pd.DataFrame()
-    for column in data.columns:
-        shingled_data_i = []
-        index_i = []
-        for i in range(window_size, data.shape[0] + 1):
-            shingled_data_i.append(data[column].iloc[i - window_size : i].values)
-            index_i.append(data.index[i - 1])
-        shingled_columns = [
-            f"{column}_t-{window_size-j-1}" for j in range(0, window_size)
-        ]
-        data_i = pd.DataFrame(shingled_data_i, columns=shingled_columns, index=index_i)
-        shingled_data = pd.concat([shingled_data, data_i.iloc[:, ::-1]], axis=1)
-    return shingled_data
+        # the frequency is only needed to turn a Timedelta into a sample count;
+        # checking it also ensures uniform sampling
+        freq = check_data_frequency(data)
+        window_size = int(window_size // freq)
+
+    if window_size < 1 or window_size > data.shape[0]:
+        raise ValueError(
+            f"Window size must be between 1 and the number of samples "
+            f"({data.shape[0]}), got {window_size}."
+        )
+    return window_size
+
+
+# wide, large numeric frames fill their column blocks from a thread pool;
+# NumPy releases the GIL while copying, so the blocks are copied in parallel
+_PARALLEL_MIN_COLUMNS = 4
+_PARALLEL_MIN_SIZE = 1_000_000
+
+
+def _fill_windows(out: np.ndarray, windows: np.ndarray) -> None:
+    n_columns = out.shape[1]
+    n_workers = min(os.cpu_count() or 1, n_columns)
+    if (
+        n_workers < 2
+        or n_columns < _PARALLEL_MIN_COLUMNS
+        or out.size < _PARALLEL_MIN_SIZE
+        or out.dtype == object
+    ):
+        np.copyto(out, windows[:, :, ::-1])
+        return
+
+    # consume the results so an error in any worker is raised here
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        list(
+            executor.map(
+                lambda c: _fill_column_block(out, windows, c), range(n_columns)
+            )
+        )
+
+
+def _fill_column_block(out: np.ndarray, windows: np.ndarray, column: int) -> None:
+    np.copyto(out[:, column, :], windows[:, column, ::-1])
 
 
 def generate_target_timeseries(
@@ -36,33 +195,90 @@ def generate_target_timeseries(
     forcast_window: typing.Union[pd.Timedelta, int],
 ) -> tuple[pd.DataFrame, pd.Index]:
 
-    # check frequency to ensure uniform sampling
-    freq = check_data_frequency(data)
+    # check frequency to ensure uniform sampling, only needed when a window is
+    # given as a Timedelta that has to be turned into a sample count
+    if isinstance(window_size, pd.Timedelta) or isinstance(
+        forcast_window, pd.Timedelta
+    ):
+        freq = check_data_frequency(data)
 
     if isinstance(window_size, pd.Timedelta):
-        window_size = window_size / freq
-        window_size = int(window_size)
+        window_size = int(window_size // freq)
 
     if isinstance(forcast_window, pd.Timedelta):
-        forcast_window = forcast_window / freq
-        forcast_window = int(forcast_window)
+        forcast_window = int(forcast_window // freq)
+
+    # both windows must fit in the data and leave at least one target sample
+    if window_size < 1 or forcast_window < 0:
+        raise ValueError(
+            "Window size must be positive and forecast window non-negative."
+        )
+    if window_size + forcast_window >= data.shape[0]:
+        raise ValueError(
+            f"Window size plus forecast window must be smaller than the number "
+            f"of samples ({data.shape[0]}), got {window_size + forcast_window}."
+        )
 
     # check to ensure single column data
     if isinstance(data, pd.DataFrame):
         if data.shape[1] != 1:
             raise ValueError("Data must be a single column DataFrame or Series.")
-    if isinstance(data, pd.Series):
-        data = data.to_frame()
 
-    # drop the initial rows that cannot be used for shingling
-    target_data = data.iloc[window_size + forcast_window :, :]
-    input_index = data.iloc[window_size:, :].index
+    # drop the initial rows that cannot be used for shingling; a Series is
+    # only turned into a frame after slicing so the dropped rows are never
+    # carried along
+    target_data = data.iloc[window_size + forcast_window :]
+    if isinstance(target_data, pd.Series):
+        target_data = target_data.to_frame()
+    input_index = data.index[window_size:]
 
     return target_data, input_index
 
 
+# sampling frequency of every index checked so far, keyed on id(index); an
+# entry is dropped as soon as its index is garbage collected
+_FREQUENCY_CACHE: dict[int, pd.Timedelta] = {}
+
+
 def check_data_frequency(data: pd.DataFrame) -> pd.Timedelta:
-    freq = data.index.diff().unique().dropna()
-    if len(freq) != 1:
-        raise ValueError("Data must be uniformly sampled.")
-    return freq[0]
+    # pandas indexes are immutable, so the result for a given index object can
+    # be reused when the same data goes through several steps of a pipeline
+    index = data.index
+    key = id(index)
+    freq = _FREQUENCY_CACHE.get(key)
+    if freq is not None:
+        return freq
+
+    if isinstance(index, (pd.DatetimeIndex, pd.TimedeltaIndex)):
+        ticks = index.asi8
+        step = _uniform_step(ticks) if ticks.shape[0] >= 2 else None
+        if step is None:
+            raise ValueError("Data must be uniformly sampled.")
+        freq = pd.Timedelta(step, unit=index.unit)
+    else:
+        # numeric and period indexes have no int64 ticks in a time unit, so
+        # their steps are compared directly
+        steps = index.diff().unique().dropna()
+        if len(steps) != 1:
+            raise ValueError("Data must be uniformly sampled.")
+        freq = steps[0]
+
+    _FREQUENCY_CACHE[key] = freq
+    weakref.finalize(index, _FREQUENCY_CACHE.pop, key, None)
+    return freq
+
+
+# number of steps compared per block in _uniform_step
+_UNIFORM_STEP_BLOCK = 65536
+
+
+def _uniform_step(ticks: np.ndarray) -> typing.Optional[int]:
+    # compare every step against the first one on the raw int64 ticks, one
+    # block at a time so a non-uniform index bails out early and the scratch
+    # diff never grows beyond a block
+    step = ticks[1] - ticks[0]
+    for start in range(0, ticks.shape[0] - 1, _UNIFORM_STEP_BLOCK):
+        block = ticks[start : start + _UNIFORM_STEP_BLOCK + 1]
+        if not np.all(np.diff(block) == step):
+            return None
+    return int(step)
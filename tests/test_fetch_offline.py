@@ -0,0 +1,306 @@
+"""Offline tests for the USGS data API using canned responses"""
+
+import datetime
+import io
+import json
+
+import pandas as pd
+import pytest
+import requests
+import urllib3
+
+from datasources.usgs import (
+    fetch_data_functional,
+    clear_cache,
+    get_gauge_fields,
+    get_gauge_data,
+)
+
+SITE_RDB = (
+    "# US Geological Survey\n"
+    "#\n"
+    "agency_cd\tsite_no\tstation_nm\tsite_tp_cd\tdec_lat_va\tdec_long_va\t"
+    "state_cd\tdrain_area_va\tparm_cd\tstat_cd\n"
+    "5s\t15s\t50s\t7s\t16s\t16s\t2s\t8s\t5s\t5s\n"
+    "USGS\t01646500\tPOTOMAC RIVER NEAR WASH, DC LITTLE FALLS PUMP STA\tST\t"
+    "38.94977778\t-77.12763889\t24\t11560\t00060\t00003\n"
+    "USGS\t01646500\tPOTOMAC RIVER NEAR WASH, DC LITTLE FALLS PUMP STA\tST\t"
+    "38.94977778\t-77.12763889\t24\t11560\t00065\t00003\n"
+    "USGS\t01646500\tPOTOMAC RIVER NEAR WASH, DC LITTLE FALLS PUMP STA\tST\t"
+    "38.94977778\t-77.12763889\t24\t11560\t\t\n"
+)
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _FakeSession:
+    def __init__(self, text):
+        self.text = text
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return _FakeResponse(self.text)
+
+
+@pytest.fixture(autouse=True)
+def _clear_usgs_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_get_gauge_fields_parses_rdb(monkeypatch):
+    monkeypatch.setattr(fetch_data_functional, "_SESSION", _FakeSession(SITE_RDB))
+
+    fields = get_gauge_fields("USGS-01646500")
+
+    assert fields["site_id"] == "01646500"
+    assert fields["site_name"].startswith("POTOMAC RIVER")
+    assert fields["latitude"] == 38.94977778
+    assert fields["longitude"] == -77.12763889
+    assert fields["state"] == "24"
+    assert fields["drainage_area"] == "11560"
+    assert fields["available_parameters"] == {
+        "00060": {"name": "streamflow", "code": "00060"},
+        "00065": {"name": "gage_height", "code": "00065"},
+    }
+
+
+def test_parse_rdb_keeps_special_characters():
+    rdb_text = (
+        "# comment\n"
+        "agency_cd\tsite_no\tstation_nm\n"
+        "5s\t15s\t50s\n"
+        'USGS\t04085427\tMANITOWOC RIVER #2 AT "MANITOWOC", WI\n'
+    )
+    table = fetch_data_functional._parse_rdb(rdb_text)
+    assert table.to_dict("records") == [
+        {
+            "agency_cd": "USGS",
+            "site_no": "04085427",
+            "station_nm": 'MANITOWOC RIVER #2 AT "MANITOWOC", WI',
+        }
+    ]
+    assert fetch_data_functional._parse_rdb("# No sites found\n").empty
+
+
+def test_get_gauge_fields_is_memoized(monkeypatch):
+    session = _FakeSession(SITE_RDB)
+    monkeypatch.setattr(fetch_data_functional, "_SESSION", session)
+
+    fields = get_gauge_fields("01646500")
+    fields["available_parameters"].clear()
+    again = get_gauge_fields("USGS-01646500")
+
+    assert len(session.calls) == 1
+    # callers get their own copy of the cached lookup
+    assert set(again["available_parameters"]) == {"00060", "00065"}
+
+    clear_cache()
+    get_gauge_fields("01646500")
+    assert len(session.calls) == 2
+
+
+def _time_series(values, code="00060", name="Streamflow, ft&#179;/s"):
+    return {
+        "variable": {
+            "variableName": name,
+            "variableCode": [{"value": code}],
+        },
+        "values": [{"value": values}],
+    }
+
+
+def _values_json(values, code="00060", name="Streamflow, ft&#179;/s"):
+    return json.dumps({"value": {"timeSeries": [_time_series(values, code, name)]}})
+
+
+def test_get_gauge_data_instantaneous_across_dst(monkeypatch):
+    values = [
+        {
+            "value": "10.5",
+            "qualifiers": ["P"],
+            "dateTime": "2024-03-10T01:45:00.000-05:00",
+        },
+        {
+            "value": "11.0",
+            "qualifiers": ["P"],
+            "dateTime": "2024-03-10T03:00:00.000-04:00",
+        },
+        {
+            "value": "-999999",
+            "qualifiers": ["P"],
+            "dateTime": "2024-03-10T03:15:00.000-04:00",
+        },
+    ]
+    monkeypatch.setattr(
+        fetch_data_functional, "_SESSION", _FakeSession(_values_json(values))
+    )
+
+    df = get_gauge_data(
+        "01646500", "2024-03-10", "2024-03-10", parameters=["streamflow"], daily=False
+    )
+
+    assert list(df.columns) == ["streamflow"]
+    assert str(df.index.tz) == "UTC"
+    assert list(df.index) == list(
+        pd.to_datetime(
+            ["2024-03-10 06:45", "2024-03-10 07:00", "2024-03-10 07:15"], utc=True
+        )
+    )
+    assert df["streamflow"].iloc[0] == 10.5
+
+
+def test_get_gauge_data_daily(monkeypatch):
+    values = [
+        {"value": "10.5", "qualifiers": ["A"], "dateTime": "2024-01-01T00:00:00.000"},
+        {"value": "Ice", "qualifiers": ["A"], "dateTime": "2024-01-02T00:00:00.000"},
+    ]
+    monkeypatch.setattr(
+        fetch_data_functional, "_SESSION", _FakeSession(_values_json(values))
+    )
+
+    df = get_gauge_data(
+        "01646500", "2024-01-01", "2024-01-02", parameters=["streamflow"]
+    )
+
+    assert df.index.tz is None
+    assert df["streamflow"].dtype == "float32"
+    assert list(df.index) == list(pd.to_datetime(["2024-01-01", "2024-01-02"]))
+    assert df["streamflow"].iloc[0] == 10.5
+    assert pd.isna(df["streamflow"].iloc[1])
+
+
+def test_get_gauge_data_batches_parameters(monkeypatch):
+    streamflow = [
+        {"value": "10.5", "qualifiers": ["A"], "dateTime": "2024-01-01T00:00:00.000"},
+        {"value": "11.5", "qualifiers": ["A"], "dateTime": "2024-01-02T00:00:00.000"},
+    ]
+    gage_height = [
+        {"value": "3.25", "qualifiers": ["A"], "dateTime": "2024-01-02T00:00:00.000"},
+    ]
+    # the service does not promise to return series in the requested order
+    body = json.dumps(
+        {
+            "value": {
+                "timeSeries": [
+                    _time_series(gage_height, "00065", "Gage height, ft"),
+                    _time_series(streamflow, "00060"),
+                ]
+            }
+        }
+    )
+    session = _FakeSession(body)
+    monkeypatch.setattr(fetch_data_functional, "_SESSION", session)
+
+    df = get_gauge_data(
+        "01646500",
+        "2024-01-01",
+        "2024-01-02",
+        parameters=["streamflow", "gage_height", "temperature"],
+    )
+
+    assert len(session.calls) == 1
+    assert session.calls[0][1]["params"]["parameterCd"] == "00060,00065,00010"
+    assert list(df.columns) == ["streamflow", "gage_height"]
+    assert df["streamflow"].tolist() == [10.5, 11.5]
+    assert pd.isna(df["gage_height"].iloc[0])
+    assert df["gage_height"].iloc[1] == 3.25
+
+
+def test_get_gauge_data_parameter_names(monkeypatch):
+    session = _FakeSession(
+        _values_json(
+            [
+                {
+                    "value": "1.0",
+                    "qualifiers": ["A"],
+                    "dateTime": "2024-01-01T00:00:00.000",
+                },
+            ]
+        )
+    )
+    monkeypatch.setattr(fetch_data_functional, "_SESSION", session)
+
+    with pytest.warns(UserWarning) as record:
+        get_gauge_data(
+            "01646500",
+            "2024-01-01",
+            "2024-01-01",
+            parameters=[
+                " streamflow ",
+                "00065 ",
+                "600",
+                "rainfall",
+                "00060",
+                "gage_height",
+            ],
+        )
+
+    assert session.calls[0][1]["params"]["parameterCd"] == "00060,00065"
+    assert [str(w.message) for w in record] == [
+        "Unknown parameter: 600",
+        "Unknown parameter: rainfall",
+    ]
+
+
+class _CannedAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, text):
+        super().__init__()
+        self.text = text
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(self.text.encode()),
+            headers={"Content-Type": "application/json"},
+            status=200,
+            preload_content=False,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+
+def test_get_gauge_data_bypasses_cache_for_recent_periods(monkeypatch, tmp_path):
+    pytest.importorskip("requests_cache")
+    session = fetch_data_functional._create_session(str(tmp_path / "usgs_cache"))
+    adapter = _CannedAdapter(
+        _values_json(
+            [
+                {
+                    "value": "1.0",
+                    "qualifiers": ["P"],
+                    "dateTime": "2024-01-01T00:00:00.000",
+                },
+            ]
+        )
+    )
+    session.mount("https://", adapter)
+    monkeypatch.setattr(fetch_data_functional, "_SESSION", session)
+
+    # past periods are served from the cache once fetched
+    for _ in range(2):
+        df = get_gauge_data(
+            "01646500", "2024-01-01", "2024-01-31", parameters=["streamflow"]
+        )
+        assert df["streamflow"].tolist() == [1.0]
+    assert adapter.sent == 1
+
+    # periods reaching today always go to the service and are not stored
+    tomorrow = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+    for _ in range(2):
+        get_gauge_data("01646500", "2024-01-01", tomorrow, parameters=["streamflow"])
+    assert adapter.sent == 3
+    assert len(list(session.cache.responses.keys())) == 1
@@ -0,0 +1,75 @@
+import warnings
+import pandas as pd
+import numpy as np
+import pytest
+from normilization import normalize, min_max_normalization, mean_std_normalization
+
+
+def generate_test_data() -> pd.DataFrame:
+    index = pd.date_range(start="2025-01-01", periods=5, freq="1h")
+    data = pd.DataFrame(
+        {"A": [1.0, 2.0, 3.0, 4.0, 10.0], "B": [-2.0, 0.0, 2.0, np.nan, 4.0]},
+        index=index,
+    )
+    return data
+
+
+def test_min_max_normalization():
+    data = generate_test_data()
+    normalized_data, normalization_parameters = min_max_normalization(data)
+
+    assert normalized_data.index.equals(data.index)
+    assert list(normalized_data.columns) == ["A", "B"]
+    assert normalization_parameters["A"] == {"min": 1.0, "max": 10.0, "mean": 4.0}
+    assert normalization_parameters["B"] == {"min": -2.0, "max": 4.0, "mean": 1.0}
+    np.testing.assert_allclose(
+        normalized_data["A"].to_numpy(), (data["A"].to_numpy() - 4.0) / 9.0
+    )
+    # missing values stay missing and are ignored by the statistics
+    assert np.isnan(normalized_data["B"].iloc[3])
+    assert normalized_data["B"].iloc[0] == pytest.approx(-0.5)
+
+
+def test_mean_std_normalization():
+    data = generate_test_data()
+    normalized_data, normalization_parameters = mean_std_normalization(data)
+
+    assert normalization_parameters["A"]["mean"] == pytest.approx(4.0)
+    assert normalization_parameters["A"]["std"] == pytest.approx(data["A"].std())
+    np.testing.assert_allclose(
+        normalized_data.to_numpy(),
+        ((data - data.mean()) / data.std()).to_numpy(),
+    )
+
+
+def test_normalization_degenerate_columns():
+    # constant, single-value and all-NaN columns give NaN or inf without warning
+    data = pd.DataFrame(
+        {
+            "A": [3.0, 3.0, 3.0],
+            "B": [np.nan, 5.0, np.nan],
+            "C": [np.nan, np.nan, np.nan],
+        }
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        min_max_data, _ = min_max_normalization(data)
+        mean_std_data, _ = mean_std_normalization(data)
+
+    expected = (data - data.mean()) / (data.max() - data.min())
+    np.testing.assert_array_equal(min_max_data.to_numpy(), expected.to_numpy())
+    expected = (data - data.mean()) / data.std()
+    np.testing.assert_array_equal(mean_std_data.to_numpy(), expected.to_numpy())
+
+
+def test_normalize_unsupported_method():
+    with pytest.raises(ValueError, match="is not supported"):
+        normalize(generate_test_data(), "z_score")
+
+
+if __name__ == "__main__":
+    test_min_max_normalization()
+    test_mean_std_normalization()
+    test_normalization_degenerate_columns()
+    test_normalize_unsupported_method()
+    print("All tests passed!")
@@ -1,14 +1,23 @@
+import gc
 import pandas as pd
 import numpy as np
 import pytest
-from sequences import shingle_timeseries, generate_target_timeseries, check_data_frequency
+import sequences
+from sequences import (
+    shingle_timeseries,
+    ishingle_timeseries,
+    shingle_reduce,
+    generate_target_timeseries,
+    check_data_frequency,
+)
+
+# seeded generator so test data, and any regressions, are reproducible
+_RNG = np.random.default_rng(42)
 
 
 def generate_test_data(start: str, end: str, freq: str) -> pd.DataFrame:
     index = pd.date_range(start=pd.Timestamp(start), end=pd.Timestamp(end), freq=freq)
-    data = pd.DataFrame(
-        {"A": np.random.rand(len(index)), "B": np.random.rand(len(index))}, index=index
-    )
+    data = pd.DataFrame(_RNG.random((len(index), 2)), columns=["A", "B"], index=index)
     return data
 
 
@@ -25,17 +34,143 @@ def test_shingle_timeseries():
     assert (
         shingled_data.shape[0] == expected_rows
     ), "Number of rows in shingled data is incorrect."
-    # check values
-    for i in shingled_data.index:
-        for cols in ["A", "B"]:
-            assert shingled_data.loc[i, f"{cols}_t-0"] == data.loc[i, cols]
-            assert (
-                shingled_data.loc[i, f"{cols}_t-1"]
-                == data.loc[i - pd.Timedelta("6h"), cols]
-            )
+    # check values: t-0 is the sample at each index, t-1 the one 6h earlier
+    aligned = data.reindex(shingled_data.index)
+    np.testing.assert_array_equal(
+        shingled_data[["A_t-0", "B_t-0"]].to_numpy(), aligned[["A", "B"]].to_numpy()
+    )
+    previous = data.shift(1, freq="6h").reindex(shingled_data.index)
+    np.testing.assert_array_equal(
+        shingled_data[["A_t-1", "B_t-1"]].to_numpy(), previous[["A", "B"]].to_numpy()
+    )
     print("All tests passed!")
 
 
+def test_ishingle_timeseries():
+    data = generate_test_data(start="2025-01-01", end="2025-01-31", freq="6h")
+    windows, index = ishingle_timeseries(data, window_size=pd.Timedelta("12h"))
+    shingled_data = shingle_timeseries(data, window_size=pd.Timedelta("12h"))
+
+    assert windows.shape == (data.shape[0] - 1, 2, 2)
+    assert index.equals(shingled_data.index)
+    # same values as the materialised frame, laid out as (window, column, lag)
+    np.testing.assert_array_equal(
+        windows.reshape(windows.shape[0], -1), shingled_data.to_numpy()
+    )
+    assert not windows.flags.writeable
+
+
+@pytest.mark.parametrize("op", ["sum", "mean", "min", "max", "median"])
+def test_shingle_reduce(op):
+    data = generate_test_data(start="2025-01-01", end="2025-01-31", freq="6h")
+    expected = getattr(data.rolling(4), op)().iloc[3:]
+
+    reduced = shingle_reduce(data, window_size=pd.Timedelta("1D"), op=op)
+    assert list(reduced.columns) == [f"A_{op}", f"B_{op}"]
+    assert reduced.index.equals(expected.index)
+    np.testing.assert_allclose(reduced.to_numpy(), expected.to_numpy())
+
+    # missing values only affect the windows that contain them
+    data.iloc[10, 0] = np.nan
+    expected = getattr(data.rolling(4), op)().iloc[3:]
+    reduced = shingle_reduce(data, window_size=pd.Timedelta("1D"), op=op)
+    np.testing.assert_allclose(reduced.to_numpy(), expected.to_numpy())
+
+
+def test_shingle_reduce_infinite_values():
+    index = pd.date_range(start="2025-01-01", periods=8, freq="1h")
+    data = pd.DataFrame({"A": [1, 2, np.inf, 4, 5, 6, 7, 8]}, index=index)
+    reduced = shingle_reduce(data, window_size=2, op="sum")
+    assert reduced["A_sum"].tolist() == [3, np.inf, np.inf, 9, 11, 13, 15]
+
+
+def test_shingle_reduce_large_offset():
+    # a large offset must not swamp the small variations between windows
+    index = pd.date_range(start="2025-01-01", periods=100_000, freq="1min")
+    steps = np.arange(len(index))
+    data = pd.DataFrame({"A": 1e12 + 0.001 * steps}, index=index)
+    reduced = shingle_reduce(data, window_size=10, op="mean")
+    expected = 0.001 * (steps[9:] - 4.5)
+    np.testing.assert_allclose(reduced["A_mean"] - 1e12, expected, atol=1e-3)
+
+
+def test_shingle_reduce_large_integers():
+    # epoch nanoseconds overflow int64 when ten of them are summed
+    index = pd.date_range(start="2025-01-01", periods=20, freq="1h")
+    data = pd.DataFrame({"A": index.as_unit("ns").asi8}, index=index)
+    reduced = shingle_reduce(data, window_size=10, op="mean")
+    expected = data.rolling(10).mean().iloc[9:]
+    np.testing.assert_allclose(reduced.to_numpy(), expected.to_numpy())
+
+
+def test_shingle_reduce_preserves_dtype():
+    index = pd.date_range(start="2025-01-01", periods=10, freq="1h")
+    data = pd.DataFrame({"A": np.arange(10, dtype=np.float32)}, index=index)
+    for op in ["sum", "mean"]:
+        assert shingle_reduce(data, window_size=3, op=op)[f"A_{op}"].dtype == np.float32
+        # the same dtype comes back when missing values route around the fast path
+        with_nan = data.copy()
+        with_nan.iloc[0, 0] = np.nan
+        assert (
+            shingle_reduce(with_nan, window_size=3, op=op)[f"A_{op}"].dtype
+            == np.float32
+        )
+
+    data = pd.DataFrame({"A": np.arange(10)}, index=index)
+    assert shingle_reduce(data, window_size=3, op="sum")["A_sum"].dtype == np.int64
+    assert shingle_reduce(data, window_size=3, op="mean")["A_mean"].dtype == np.float64
+
+
+def test_shingle_reduce_unsupported():
+    data = generate_test_data(start="2025-01-01", end="2025-01-02", freq="1h")
+    with pytest.raises(ValueError, match="is not supported"):
+        shingle_reduce(data, window_size=3, op="skew")
+
+
+def test_shingle_timeseries_preserves_dtype():
+    index = pd.date_range(start="2025-01-01", periods=10, freq="1h")
+    data = pd.DataFrame(
+        {"A": np.arange(10, dtype=np.float32), "B": np.arange(10, dtype=np.float32)},
+        index=index,
+    )
+    shingled_data = shingle_timeseries(data, window_size=3)
+    assert (shingled_data.dtypes == np.float32).all()
+
+    # mixed numeric columns are promoted once to a common numeric dtype
+    data["B"] = np.arange(10, dtype=np.int64)
+    shingled_data = shingle_timeseries(data, window_size=3)
+    assert (shingled_data.dtypes == np.float64).all()
+
+    # an explicit dtype casts the output, e.g. float32 for ML consumers
+    shingled_data = shingle_timeseries(data, window_size=3, dtype=np.float32)
+    assert (shingled_data.dtypes == np.float32).all()
+    assert shingled_data["B_t-2"].iloc[0] == 0.0
+
+
+def test_shingle_timeseries_integer_window_skips_frequency_check():
+    # integer windows count samples, so irregular sampling is allowed
+    index = pd.DatetimeIndex(
+        ["2025-01-01 00:00:00", "2025-01-01 01:00:00", "2025-01-01 03:00:00"]
+    )
+    data = pd.DataFrame({"A": [1.0, 2.0, 3.0]}, index=index)
+    shingled_data = shingle_timeseries(data, window_size=2)
+    assert list(shingled_data.index) == list(index[1:])
+    assert list(shingled_data["A_t-1"]) == [1.0, 2.0]
+
+    with pytest.raises(ValueError, match="Data must be uniformly sampled"):
+        shingle_timeseries(data, window_size=pd.Timedelta("2h"))
+
+
+def test_shingle_timeseries_window_too_large():
+    data = generate_test_data(start="2025-01-01", end="2025-01-01 05:00", freq="1h")
+    with pytest.raises(ValueError, match="Window size must be between 1"):
+        shingle_timeseries(data, window_size=7)
+    with pytest.raises(ValueError, match="Window size must be between 1"):
+        shingle_timeseries(data, window_size=pd.Timedelta("7h"))
+    with pytest.raises(ValueError, match="Window size must be between 1"):
+        ishingle_timeseries(data, window_size=0)
+
+
 def test_check_data_frequency():
     # Test with uniformly sampled data
     data = generate_test_data(start="2025-01-01", end="2025-01-10", freq="1h")
@@ -48,6 +183,20 @@ def test_check_data_frequency():
     assert freq == pd.Timedelta("15min"), "Frequency should be 15 minutes"
 
 
+def test_check_data_frequency_cache():
+    data = generate_test_data(start="2025-01-01", end="2025-01-10", freq="1h")
+    key = id(data.index)
+    assert check_data_frequency(data) == pd.Timedelta("1h")
+    assert sequences._FREQUENCY_CACHE[key] == pd.Timedelta("1h")
+    # a frame sharing the same index reuses the cached frequency
+    assert check_data_frequency(data[["A"]]) == pd.Timedelta("1h")
+
+    # the entry goes away together with its index
+    del data
+    gc.collect()
+    assert key not in sequences._FREQUENCY_CACHE
+
+
 def test_check_data_frequency_non_uniform():
     # Test with non-uniformly sampled data
     index = pd.DatetimeIndex(
@@ -59,6 +208,22 @@ def test_check_data_frequency_non_uniform():
         check_data_frequency(data)
 
 
+def test_check_data_frequency_other_indexes():
+    # Numeric and period indexes report their step in their own terms
+    values = {"A": [1.0, 2.0, 3.0, 4.0]}
+    assert check_data_frequency(pd.DataFrame(values)) == 1
+    data = pd.DataFrame(values, index=pd.Index([0.0, 0.5, 1.0, 1.5]))
+    assert check_data_frequency(data) == 0.5
+    data = pd.DataFrame(
+        values, index=pd.period_range("2025-01-01", periods=4, freq="h")
+    )
+    assert check_data_frequency(data) == pd.offsets.Hour()
+
+    data = pd.DataFrame(values, index=pd.Index([0.0, 0.5, 1.5, 2.0]))
+    with pytest.raises(ValueError, match="Data must be uniformly sampled"):
+        check_data_frequency(data)
+
+
 def test_generate_target_timeseries_dataframe():
     # Test with DataFrame input
     data = generate_test_data(start="2025-01-01", end="2025-01-10", freq="1h")
@@ -128,12 +293,35 @@ def test_generate_target_timeseries_multi_column_error():
         generate_target_timeseries(data, window_size=3, forcast_window=2)
 
 
+def test_generate_target_timeseries_window_too_large():
+    data = generate_test_data(start="2025-01-01", end="2025-01-01 05:00", freq="1h")
+
+    with pytest.raises(ValueError, match="must be smaller than the number"):
+        generate_target_timeseries(data[["A"]], window_size=4, forcast_window=2)
+    with pytest.raises(ValueError, match="must be positive"):
+        generate_target_timeseries(data[["A"]], window_size=0, forcast_window=2)
+
+
 if __name__ == "__main__":
     test_shingle_timeseries()
+    test_ishingle_timeseries()
+    for op in ["sum", "mean", "min", "max", "median"]:
+        test_shingle_reduce(op)
+    test_shingle_reduce_infinite_values()
+    test_shingle_reduce_large_offset()
+    test_shingle_reduce_large_integers()
+    test_shingle_reduce_preserves_dtype()
+    test_shingle_reduce_unsupported()
+    test_shingle_timeseries_preserves_dtype()
+    test_shingle_timeseries_integer_window_skips_frequency_check()
+    test_shingle_timeseries_window_too_large()
     test_check_data_frequency()
+    test_check_data_frequency_cache()
     test_check_data_frequency_non_uniform()
+    test_check_data_frequency_other_indexes()
     test_generate_target_timeseries_dataframe()
     test_generate_target_timeseries_series()
     test_generate_target_timeseries_timedelta()
     test_generate_target_timeseries_multi_column_error()
+    test_generate_target_timeseries_window_too_large()
     print("All tests passed!")